@@ -1,6 +1,6 @@
 import typing
-import threading
 from .client import Client
+from .message import PumpdulerMessage
 from .logger import logger
 
 
@@ -13,8 +13,11 @@ class Channel:
     """
     def __init__(self, name: str) -> None:
         self._name: str = name
-        self._clients: typing.List[Client] = []
-        self._lock: threading.Lock = threading.Lock()
+        self._clients: typing.Dict[int, Client] = {}   # subscribers by `id` of the client
+        # immutable copy of the subscribers, replaced on every change so it's read without lock,
+        # subscribers are only changed by the event loop of the client manager so changing
+        # them doesn't need a lock either.
+        self._snapshot: typing.Tuple[Client, ...] = ()
 
     @property
     def name(self) -> str:
@@ -28,7 +31,7 @@ class Channel:
         """
         Returns list of subscribers to the channel.
         """
-        return self._clients.copy()
+        return list(self._snapshot)
 
     def subscribers_count(self) -> int:
         """
@@ -46,10 +49,9 @@ class Channel:
         Returns:
             (None)
         """
-        logger.info(f"{client._sock} wants to subscribe {self.name}")
-        with self._lock:
-            self._clients.append(client)
-            logger.info(f"{client._sock} subscribed {self.name}")
+        self._clients[id(client)] = client
+        self._snapshot = tuple(self._clients.values())
+        logger.info("%s subscribed %s", client._sock, self.name)
 
     def unsubscribe(self, client: Client):
         """
@@ -61,10 +63,9 @@ class Channel:
         Returns:
             (None)
         """
-        logger.info(f"{client._sock} wants to unsubscribe {self.name}")
-        with self._lock:
-            self._clients.remove(client)
-            logger.info(f"{client._sock} unsubscribed {self.name}")
+        self._clients.pop(id(client), None)
+        self._snapshot = tuple(self._clients.values())
+        logger.info("%s unsubscribed %s", client._sock, self.name)
 
     def broadcast(self, message_type: str, message_data: typing.Any):
         """
@@ -77,7 +78,25 @@ class Channel:
         Returns:
             (None)
         """
-        logger.debug(f"[:Channel] broadcasting a message with type: {message_type}")
-        with self._lock:
-            for client in self._clients:
-                client.send_message(message_type=message_type, message_data=message_data)
+        logger.debug("[:Channel] broadcasting a message with type: %s", message_type)
+        # message is same for all subscribers, dump it only once
+        payload = PumpdulerMessage.dump({
+            "type": message_type,
+            "data": message_data
+        })
+        self.broadcast_raw(payload)
+
+    def broadcast_raw(self, payload: bytes):
+        """
+        Send an already dumped message to all subscribers in this channel.
+
+        Args:
+            payload (bytes): message dumped using `PumpdulerMessage.dump`
+
+        Returns:
+            (None)
+        """
+        # snapshot is never changed, so no lock is needed and subscribing/unsubscribing
+        # is not blocked by the broadcast.
+        for client in self._snapshot:
+            client.send_raw(payload)
@@ -1,6 +1,7 @@
 import typing
 from .client import Client
 from .channel import Channel
+from .message import PumpdulerMessage
 from .logger import logger
 
 
@@ -23,12 +24,12 @@ class ChannelManager:
         """
         return len(self._channels)
 
-    def get_channel_names(self) -> typing.List[str]:
+    def get_channel_names(self) -> typing.Tuple[str, ...]:
         """
         Returns:
-            (list(str)) list of channel names
+            (tuple(str)) channel names
         """
-        return list(self._channels.keys())
+        return tuple(self._channels)
 
     def subscribe(self, name: str, client: Client) -> None:
         """"
@@ -42,10 +43,12 @@ class ChannelManager:
         Returns:
             (None)
         """
-        if name not in self._channels:
-            logger.debug(f"Channel:{name} is created!")
-            self._channels[name] = Channel(name=name)
-        self._channels[name].subscribe(client)
+        channel = self._channels.get(name)
+        if channel is None:
+            logger.debug("Channel:%s is created!", name)
+            channel = self._channels[name] = Channel(name=name)
+        channel.subscribe(client)
+        client._subscribed_channels.add(name)
 
     def get_subscribed_channels(self, client: Client) -> typing.List[str]:
         """
@@ -57,11 +60,7 @@ class ChannelManager:
         Returns:
             (list(str)) subscribed channel names
         """
-        channels = []
-        for channel in self._channels:
-            if client in self._channels[channel].subscribers:
-                channels.append(channel)
-        return channels
+        return list(client._subscribed_channels)
 
     def unsubscribe(self, name: str, client: Client) -> None:
         """
@@ -76,11 +75,14 @@ class ChannelManager:
         Returns:
             (None)
         """
-        if name in self._channels:
-            self._channels[name].unsubscribe(client)
-            if self._channels[name].subscribers_count() == 0:
-                logger.debug(f"Channel:{name} is destroyed!")
-                self._channels.pop(name)
+        client._subscribed_channels.discard(name)
+        channel = self._channels.get(name)
+        if channel is None:
+            return
+        channel.unsubscribe(client)
+        if channel.subscribers_count() == 0:
+            logger.debug("Channel:%s is destroyed!", name)
+            del self._channels[name]
 
     def broadcast_message(
         self,
@@ -99,11 +101,29 @@ class ChannelManager:
         Returns:
             (None)
         """
-        logger.info(f"[:ChannelManager] broadcast message with type:{message_type} in channels:{channel_names}")
+        logger.info("[:ChannelManager] broadcast message with type:%s in channels:%s", message_type, channel_names)
+        # message is same for all channels, dump it only once
+        payload = PumpdulerMessage.dump({
+            "type": message_type,
+            "data": message_data
+        })
+        self.broadcast_raw(channel_names=channel_names, payload=payload)
+
+    def broadcast_raw(self, channel_names: typing.List[str], payload: bytes):
+        """
+        Send an already dumped message to clients connected to the channels.
+
+        Args:
+            channel_names (list(str)): list of channel names
+            payload (bytes): message dumped using `PumpdulerMessage.dump`
+
+        Returns:
+            (None)
+        """
         for channel_name in channel_names:
-            if channel_name in self._channels:
-                channel = self._channels[channel_name]
-                channel.broadcast(
-                    message_type=message_type,
-                    message_data=message_data
-                )
+            channel = self._channels.get(channel_name)
+            if channel is not None:
+                channel.broadcast_raw(payload)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._channels
@@ -4,6 +4,7 @@ from .constants import Actions, SeverToClientMessageTypes
 from .functions import get_datetime
 from .message import PumpdulerMessage
 from .logger import logger
+from .import config
 
 if typing.TYPE_CHECKING:
     from .client_manager import ClientManager
@@ -13,31 +14,38 @@ class Client:
     """
     Holds socket object and provides the methods send and process the message.
     """
+    SENDMSG_MAX_BUFFERS: int = 1024    # maximum number of buffers to pass to a single `sendmsg`
+    HAS_SENDMSG: bool = hasattr(socket.socket, "sendmsg")  # `sendmsg` is not available on every platform
+
     def __init__(self, sock: socket.socket, client_manager: 'ClientManager'):
         self._sock: socket.socket = sock
         self.client_manager: 'ClientManager' = client_manager
         self.timestamp: float = get_datetime().timestamp()
         self.sent_data_size: int = 0
         self.received_data_size: int = 0
-        self.action_func_mapping = {
-            Actions.PING: self._ping,
-            Actions.SUBSCRIBE: self._subscribe,
-            Actions.UNSUBSCRIBE: self._unsubscribe,
-            Actions.SERVER_INFO: self._server_info,
-            Actions.PUBLISH: self._publish,
-            Actions.ADD_TIME_EVENT: self._add_time_event,
-        }
+        self._buffer: bytearray = bytearray()   # received data waiting for the end of the message
+        self._subscribed_channels: typing.Set[str] = set()     # names of the subscribed channels
+        # dumped messages waiting to be sent, partially sent one is kept as a `memoryview` of its rest
+        self._outbox: typing.List[typing.Union[bytes, memoryview]] = []
+        self._outbox_size: int = 0  # size of the messages in the outbox
+        self._is_waiting_writable: bool = False     # socket is watched by client manager to be writable
+        # unsent size of the messages that were in the outbox when the socket started to be
+        # watched, only messages queued after that are counted for `config.MAX_OUTBOX_SIZE`
+        self._backlog_size: int = 0
+        self._is_lagging: bool = False  # client is not reading the messages and will be disconnected
+
+    # functions for the actions receive the message as it's loaded, see `process_message`
 
-    def _ping(self, *args, **kwargs):
+    def _ping(self, message: typing.Dict[str, typing.Any]):
         self.send_message(SeverToClientMessageTypes.MESSAGE, "PONG")
 
-    def _subscribe(self, channel_name: str, *args, **kwargs):
-        self.client_manager.channel_manager.subscribe(channel_name, self)
+    def _subscribe(self, message: typing.Dict[str, typing.Any]):
+        self.client_manager.channel_manager.subscribe(message["channel_name"], self)
 
-    def _unsubscribe(self, channel_name: str, *args, **kwargs):
-        self.client_manager.channel_manager.unsubscribe(channel_name, self)
+    def _unsubscribe(self, message: typing.Dict[str, typing.Any]):
+        self.client_manager.channel_manager.unsubscribe(message["channel_name"], self)
 
-    def _server_info(self, *args, **kwargs):
+    def _server_info(self, message: typing.Dict[str, typing.Any]):
         server = self.client_manager.server
         response_data = {
             "started_time": server.init_time,
@@ -49,25 +57,37 @@ class Client:
         }
         self.send_message(SeverToClientMessageTypes.MESSAGE, response_data)
 
-    def _publish(self, channel_name: str, data: typing.Any, *args, **kwargs):
+    def _publish(self, message: typing.Dict[str, typing.Any]):
         self.client_manager.channel_manager.broadcast_message(
-            channel_names=[channel_name],
+            channel_names=[message["channel_name"]],
             message_type=SeverToClientMessageTypes.PUBLISHED_EVENT,
-            message_data=data
+            message_data=message["data"]
         )
 
-    def _add_time_event(self, channel_name: str, exec_timestamp: float, data: typing.Any, *args, **kwargs):
+    def _add_time_event(self, message: typing.Dict[str, typing.Any]):
         self.client_manager.time_event_manager.add_event(
-            channel=channel_name,
-            data=data,
-            exec_dt=exec_timestamp
+            channel=message["channel_name"],
+            data=message["data"],
+            exec_dt=message["exec_timestamp"]
         )
 
+    # functions for the actions, created once for all clients
+    action_func_mapping = {
+        Actions.PING: _ping,
+        Actions.SUBSCRIBE: _subscribe,
+        Actions.UNSUBSCRIBE: _unsubscribe,
+        Actions.SERVER_INFO: _server_info,
+        Actions.PUBLISH: _publish,
+        Actions.ADD_TIME_EVENT: _add_time_event,
+    }
+
     def process_message(self, data: typing.Dict[str, typing.Any]):
         """
         Process the message, checks for the action of the message and if
         there's no function in mapping for that then sends an error message
-        to the current client, otherwise will execute corresponding function.
+        to the current client, otherwise will execute corresponding function,
+        the data is passed to the function as it is, without copying it to
+        keyword arguments.
 
         Args:
             data (dict(str, Any)): data containing `action` key and other info
@@ -76,16 +96,16 @@ class Client:
             (None)
         """
         action = data['action']     # see `pumpduler.constants.Actions`
-        if action in self.action_func_mapping:
-            func = self.action_func_mapping[action]
-            func(**data)
+        func = self.action_func_mapping.get(action)
+        if func is not None:
+            func(self, data)
         else:
-            logger.info(f"Unknown or invalid action request: \"{action}\" from client:( {self._sock}")
+            logger.info("Unknown or invalid action request: \"%s\" from client:( %s", action, self._sock)
             self.send_message(SeverToClientMessageTypes.ERROR_MESSAGE, {"message": f"Unknown action: {action}"})
 
     def send_message(self, message_type: str, message_data: typing.Any):
         """
-        Send a message to the socket object of this client.
+        Send a message to the socket object of this client, see `send_raw`.
 
         Args:
             message_type (str): type of the message, see `pumpduler.constants.SeverToClientMessageTypes`
@@ -98,5 +118,92 @@ class Client:
             "type": message_type,
             "data": message_data
         })
-        logger.debug(f"Message will be sent to client: {self._sock}")
-        self._sock.sendall(dumped_message)
+        self.send_raw(dumped_message)
+
+    def send_raw(self, payload: bytes):
+        """
+        Send an already dumped message to the socket object of this client,
+        used when the same message is sent to many clients.
+
+        The message is added to the outbox and is sent when the client
+        manager flushes the clients, so messages queued together are sent
+        with a single call.
+
+        If the socket is waiting to be writable and the messages queued
+        after it started waiting exceed `config.MAX_OUTBOX_SIZE`, then the
+        client is not reading and it's disconnected, the partially sent
+        message is not counted.
+
+        Args:
+            payload (bytes): message dumped using `PumpdulerMessage.dump`
+
+        Returns:
+            (None)
+        """
+        if self._is_lagging is True:
+            return
+        self._outbox.append(payload)
+        self._outbox_size += len(payload)
+        if (
+            self._is_waiting_writable is True
+            and self._outbox_size - max(self._backlog_size, len(self._outbox[0])) > config.MAX_OUTBOX_SIZE
+        ):
+            logger.warning("Disconnecting lagging client:( %s, unsent messages size: %s", self._sock, self._outbox_size)
+            self._is_lagging = True
+            self._outbox.clear()
+            self._outbox_size = 0
+            self._backlog_size = 0
+            # client manager removes the client when the disconnection is received
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        self.client_manager.schedule_flush(self)
+
+    def flush(self):
+        """
+        Send messages in the outbox to the socket object of this client,
+        uses `sendmsg` to send them together without joining them.
+
+        The socket is non-blocking, if it can not take all the messages
+        then the rest are kept and client manager watches the socket to
+        send them when it's writable.
+
+        Returns:
+            (None)
+        """
+        outbox = self._outbox
+        if not outbox:
+            return
+        logger.debug("Messages will be sent to client: %s", self._sock)
+        try:
+            while outbox:
+                if self.HAS_SENDMSG is True:
+                    sent_size = self._sock.sendmsg(outbox[:self.SENDMSG_MAX_BUFFERS])
+                else:
+                    sent_size = self._sock.send(outbox[0])
+                self._outbox_size -= sent_size
+                self._backlog_size = max(self._backlog_size - sent_size, 0)
+                # removing the sent messages, partially sent one is kept from where it's left
+                index = 0
+                while index < len(outbox) and sent_size >= len(outbox[index]):
+                    sent_size -= len(outbox[index])
+                    index += 1
+                del outbox[:index]
+                if sent_size > 0:
+                    outbox[0] = memoryview(outbox[0])[sent_size:]
+        except BlockingIOError:
+            pass    # socket buffer is full, rest is sent when it's writable
+        except OSError:
+            # connection is broken, messages can not be sent
+            outbox.clear()
+            self._outbox_size = 0
+            raise
+        finally:
+            is_waiting_writable = len(outbox) > 0
+            if is_waiting_writable is not self._is_waiting_writable:
+                self._is_waiting_writable = is_waiting_writable
+                # messages already queued are not counted as lagging
+                self._backlog_size = self._outbox_size
+                self.client_manager.watch_writable(self, is_waiting_writable)
@@ -1,6 +1,8 @@
 import typing
+import time
 import socket
-import threading
+import logging
+import selectors
 from .client import Client
 from .time_event_manager import TimeEventManager
 from .channel_manager import ChannelManager
@@ -11,6 +13,9 @@ from .import config
 if typing.TYPE_CHECKING:
     from .server import Server
 
+# debug logs of the hot paths are skipped entirely when debug logging is disabled
+_DEBUG: bool = logger.isEnabledFor(logging.DEBUG)
+
 
 class ClientManager(object):
     """
@@ -19,16 +24,27 @@ class ClientManager(object):
     handling the clients.
 
     When a client is added it is managed by this class without
-    any other dependencies, this also manages the
-    `accept_connections_event` of the server to restrict the
-    size of the clients.
+    any other dependencies, the server socket and all clients are
+    handled by the single thread running `run`, this also stops
+    accepting the connections to restrict the size of the clients.
     """
+    ACCEPT_RETRY_DELAY: float = 1.0     # seconds to stop accepting when accepting a connection fails
+
     def __init__(self, server: 'Server') -> None:
-        self._server: 'Server' = server     # server is required for the event `accept_connections_event`
+        self._server: 'Server' = server
 
-        self._clients: typing.List[Client] = []     # all clients
-        # lock is used when adding, removing the client
-        self._clients_lock: threading.Lock = threading.Lock()
+        # all clients by `id` of the client, only used by the thread running `run`
+        self._clients: typing.Dict[int, Client] = {}
+        self._unflushed_clients: typing.Set[Client] = set()     # clients having messages in the outbox
+
+        # selector watching the server socket and all client sockets
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._server_sock: socket.socket = None
+        self._is_accepting: bool = False    # server socket is registered to the selector or not
+        self._accept_retry_at: typing.Optional[float] = None    # monotonic time to accept again after a failure
+        # buffer the clients are received into, reused for every read
+        self._read_buffer: bytearray = bytearray(config.READ_SIZE)
+        self._read_view: memoryview = memoryview(self._read_buffer)
 
         self._channel_manager: ChannelManager = ChannelManager()    # manages the channels
         self._time_event_manager: TimeEventManager = TimeEventManager(client_manager=self)  # manages the time events
@@ -52,6 +68,51 @@ class ClientManager(object):
         """
         return len(self._clients)
 
+    def schedule_flush(self, client: Client):
+        """
+        Schedule sending the outbox of the client, it's sent on the
+        next `flush_clients` call.
+
+        Args:
+            client (pumpduler.client.Client): an object of `Client`
+
+        Returns:
+            (None)
+        """
+        self._unflushed_clients.add(client)
+
+    def watch_writable(self, client: Client, watch: bool):
+        """
+        Start/stop watching the socket of the client to be writable,
+        the outbox of the client is flushed when it's writable.
+
+        Args:
+            client (pumpduler.client.Client): an object of `Client`
+            watch (bool): watch the socket or not
+
+        Returns:
+            (None)
+        """
+        events = selectors.EVENT_READ
+        if watch is True:
+            events |= selectors.EVENT_WRITE
+        try:
+            self._selector.modify(client._sock, events, client)
+        except (KeyError, ValueError, OSError):
+            pass    # client is already removed
+
+    def flush_clients(self):
+        """
+        Send the messages in the outbox of all clients scheduled to be flushed.
+        """
+        while self._unflushed_clients:
+            client = self._unflushed_clients.pop()
+            try:
+                client.flush()
+            except OSError as e:
+                # client is removed by the loop when its disconnection is received
+                logger.info("Failed to send messages to client:(%s error:(%s", client._sock, e)
+
     def add_client(self, sock: socket.socket):
         """
         Add a client to the manager to manage it.
@@ -62,32 +123,130 @@ class ClientManager(object):
         Returns:
             (None)
         """
-        logger.debug(f"Adding client to the list: {sock}")
-        with self._clients_lock:
-            # creating client object and adding it to the list
-            client = Client(
-                sock=sock,
-                client_manager=self,
-            )
-            self._clients.append(client)
-            logger.debug(f"Client added to the list: {sock}")
-
-            # checking if the number of clients are equal to the max client or not
-            if len(self._clients) == config.MAX_CLIENTS:
-                logger.info(f"Stopping accepting more connections, max clients count reached {len(self._clients)}/{config.MAX_CLIENTS}")
-                self._server.accept_connections_event.clear()
-
-            # creating a thread to handle the client and starting it.
-            thread = threading.Thread(target=self._handle, args=(client,))
-            thread.start()
+        logger.debug("Adding client to the list: %s", sock)
+        # sending must not block the other clients, unsent data is kept in the outbox
+        sock.setblocking(False)
+        if sock.family == socket.AF_INET:
+            # messages are small, do not wait to merge them with Nagle's algorithm
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # creating client object and adding it to the list
+        client = Client(
+            sock=sock,
+            client_manager=self,
+        )
+        self._clients[id(client)] = client
+        logger.debug("Client added to the list: %s", sock)
+
+        # registering the socket to the selector, the client will be
+        # handled when it's readable.
+        self._selector.register(sock, selectors.EVENT_READ, client)
+
+        # checking if the number of clients are equal to the max client or not
+        if len(self._clients) == config.MAX_CLIENTS:
+            logger.info("Stopping accepting more connections, max clients count reached %s/%s", len(self._clients), config.MAX_CLIENTS)
+            self._set_accepting(False)
+
+    def _set_accepting(self, accept: bool):
+        """
+        Start/stop accepting the connections by registering/unregistering
+        the server socket to the selector.
+
+        Args:
+            accept (bool): accept the connections or not
+
+        Returns:
+            (None)
+        """
+        if accept is self._is_accepting:
+            return
+        if accept is True:
+            self._selector.register(self._server_sock, selectors.EVENT_READ)
+        else:
+            self._selector.unregister(self._server_sock)
+        self._is_accepting = accept
+
+    def _accept(self):
+        """
+        Accepts the pending connections from the server socket and adds
+        the clients, stops when there's no pending connection or the
+        clients limit is reached.
+        """
+        while self._is_accepting is True:
+            try:
+                client_sock, addr = self._server_sock.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                # server socket stays readable (e.g. no file descriptors left), accepting is
+                # stopped for a while so the loop doesn't keep failing on it.
+                logger.error("Failed to accept the connection, retrying in %s seconds: %s", self.ACCEPT_RETRY_DELAY, e)
+                self._set_accepting(False)
+                self._accept_retry_at = time.monotonic() + self.ACCEPT_RETRY_DELAY
+                return
+            logger.info("Client connected: %s || %s", client_sock, addr)
+            self.add_client(client_sock)
+
+    def _retry_accepting(self):
+        """
+        Starts accepting the connections again when the delay after an
+        accepting failure is over.
+        """
+        if self._accept_retry_at is None or time.monotonic() < self._accept_retry_at:
+            return
+        self._accept_retry_at = None
+        if len(self._clients) < config.MAX_CLIENTS:
+            self._set_accepting(True)
+
+    def _get_timeout(self) -> typing.Optional[float]:
+        """
+        Returns:
+            (float, optional) seconds to wait for the sockets, until the next time event is due
+            or accepting is retried, `None` to wait without timeout.
+        """
+        timeout = self._time_event_manager.get_timeout()
+        if self._accept_retry_at is not None:
+            retry_timeout = max(self._accept_retry_at - time.monotonic(), 0)
+            if timeout is None or retry_timeout < timeout:
+                timeout = retry_timeout
+        return timeout
+
+    def run(self, server_sock: socket.socket):
+        """
+        Event loop of the client manager, waits for the server socket and
+        the client sockets to be readable, accepts the connections,
+        handles the clients and executes the due time events, everything
+        is handled by this single thread so the clients do not need any lock.
+
+        Args:
+            server_sock (socket.socket): listening socket of the server
+
+        Returns:
+            (None)
+        """
+        logger.debug("Starting client handler loop")
+        self._server_sock = server_sock
+        self._set_accepting(True)
+        while True:
+            # waiting for the clients only until the next time event is due
+            for key, mask in self._selector.select(self._get_timeout()):
+                if key.fileobj is self._server_sock:
+                    self._accept()
+                    continue
+                if mask & selectors.EVENT_WRITE:
+                    self.schedule_flush(key.data)
+                if mask & selectors.EVENT_READ:
+                    self._handle(key.data)
+            self._retry_accepting()
+            self._time_event_manager.broadcast_due_events()
+            # messages of all handled clients and time events are queued, sending them together
+            self.flush_clients()
 
     def _handle(self, client: Client):
         """
-        Handles the client, this will receive the data from
-        the socket and also checks for the processable data
-        and passes the parsed data to the method of client
-        object, this happens in a infinite loop and the loop
-        is only stopped when client is disconnected.
+        Handles the client when its socket is readable, this will
+        receive the data from the socket and also checks for the
+        processable data and passes the parsed data to the method
+        of client object, client is removed when it is disconnected.
 
         Args:
             client (pumpduler.client.Client): an object of `Client`
@@ -95,39 +254,53 @@ class ClientManager(object):
         Returns:
             (None)
         """
-        logger.debug(f"Handling client: {client._sock}")
+        if _DEBUG:
+            logger.debug("Handling client: %s", client._sock)
         sock = client._sock     # socket object of client
-        data = b""  # buffer data
+        try:
+            size = sock.recv_into(self._read_buffer)
+        except BlockingIOError:
+            return  # nothing to receive yet
+        except OSError as e:
+            # connection is broken (reset, timed out, unreachable), only this client is removed
+            logger.info("Failed to receive from client:( %s error:( %s", sock, e)
+            size = 0
+        if size == 0:   # there was no data in chunk, client is disconnected
+            logger.info("Client disconnected: %s", sock)
+            self._remove_client(client)
+            return
+        buffer = client._buffer
+        # data before the received chunk has no end char, so search only the new part
+        search_from = len(buffer)
+        buffer += self._read_view[:size]   # add the chunk to data to complete it.
         while True:
-            try:
-                chunk = sock.recv(config.READ_SIZE)
-            except ConnectionError:
-                # client is disconnected, now remove the client
-                logger.info(f"Client disconnected: {sock}")
-                self._remove_client(client)
+            index = buffer.find(PumpdulerMessage.MESSAGE_END_SIGN, search_from)
+            if index < 0:   # no complete message in the data
                 break
-            data += chunk   # add the chunk to data to complete it.
-            while PumpdulerMessage.MESSAGE_END_SIGN in data:    # if the end char in data then process it
-                # splitting it in two parts one is processable and another is other part of data to be reused
-                processable_entity, data = data.split(PumpdulerMessage.MESSAGE_END_SIGN, 1)
-                try:
-                    # parse the data and send it to the client to process the message
-                    processed_entity = PumpdulerMessage.load(processable_entity)
-                except ValueError:
-                    logger.error(f"Unprocessable entity (VALUE ERROR) client:({client._sock} chunk:({chunk} data:({data}")
+            # taking the processable part and removing it from the data, rest of it will be reused
+            processable_entity = bytes(buffer[:index])
+            del buffer[:index + len(PumpdulerMessage.MESSAGE_END_SIGN)]
+            search_from = 0
+            try:
+                # parse the data and send it to the client to process the message
+                processed_entity = PumpdulerMessage.load(processable_entity)
+            except ValueError:
+                if _DEBUG:
+                    logger.error("Unprocessable entity (VALUE ERROR) client:(%s entity:(%s", client._sock, processable_entity)
                 else:
-                    client.process_message(processed_entity)
-            if not chunk:   # there was no data in chunk, client is disconnected
-                logger.info(f"Client disconnected: {sock}")
-                self._remove_client(client)
-                break
+                    logger.error("Unprocessable entity (VALUE ERROR) client:(%s size:(%d bytes", client._sock, len(processable_entity))
+                continue
+            try:
+                client.process_message(processed_entity)
+            except Exception as e:
+                # the loop handles all clients, one failing message must not stop it
+                logger.error("Failed to process the message of client:(%s error:(%s", client._sock, e)
 
     def _remove_client(self, client: Client) -> None:
         """
         Remove the client from the list of client manager and also
         performs operations such starting to accept the connections
-        by changing the value of event and removing the client from
-        the subscribed channels.
+        and removing the client from the subscribed channels.
 
         Args:
             client (pumpduler.client.Client): an object of `Client`
@@ -135,27 +308,36 @@ class ClientManager(object):
         Returns:
             (None)
         """
-        with self._clients_lock:
-            logger.debug(f"Removing client: {client._sock}")
-
-            # check for the subscribed channels, if there're then remove the
-            # client from those all channels
-            subscribed_channels = self._channel_manager.get_subscribed_channels(client)
-            if len(subscribed_channels) > 0:
-                logger.debug(f"{client._sock} is subscribed to channels!")
-                for channel in subscribed_channels:
-                    logger.debug(f"Unsubscribe channel:( {channel} for client:( {client._sock}")
-                    self._channel_manager.unsubscribe(channel, client)
-
-            # removing client from the list
-            self._clients.remove(client)
-            # shutdown and closing connection
+        if _DEBUG:
+            logger.debug("Removing client: %s", client._sock)
+
+        # check for the subscribed channels, if there're then remove the
+        # client from those all channels
+        subscribed_channels = self._channel_manager.get_subscribed_channels(client)
+        if len(subscribed_channels) > 0:
+            if _DEBUG:
+                logger.debug("%s is subscribed to channels!", client._sock)
+            for channel in subscribed_channels:
+                if _DEBUG:
+                    logger.debug("Unsubscribe channel:( %s for client:( %s", channel, client._sock)
+                self._channel_manager.unsubscribe(channel, client)
+
+        # removing client from the list and the selector
+        self._clients.pop(id(client), None)
+        self._unflushed_clients.discard(client)
+        self._selector.unregister(client._sock)
+        # shutdown and closing connection
+        try:
             client._sock.shutdown(socket.SHUT_RDWR)
-            client._sock.close()
-            logger.debug(f"Client {client._sock} removed.")
-
-            # start accepting other connections if it's necessary
-            if len(self._clients) < config.MAX_CLIENTS:
-                if self._server.accept_connections_event.is_set() is False:
-                    self._server.accept_connections_event.set()
-                    logger.info(f"Starting accepting connections :) {self.clients_count()}/{config.MAX_CLIENTS}")
+        except OSError:
+            pass    # connection is already closed by the client
+        client._sock.close()
+        if _DEBUG:
+            logger.debug("Client %s removed.", client._sock)
+
+        # start accepting other connections if it's necessary
+        if len(self._clients) < config.MAX_CLIENTS:
+            if self._is_accepting is False:
+                self._accept_retry_at = None
+                self._set_accepting(True)
+                logger.info("Starting accepting connections :) %s/%s", self.clients_count(), config.MAX_CLIENTS)
@@ -14,7 +14,9 @@ UNIX_SOCKET_PATH: str = None  # must be an absolute path
 
 READ_SIZE: int = 10240   # read size of the socket
 MAX_CLIENTS: int = 512    # maximum number of clients
-MESSAGE_PARSER_CLASS: str = "pumpduler.parsers:JSON"     # parser class, must have `encode` and `decode` methods
+MAX_OUTBOX_SIZE: int = 1048576    # maximum size of the unsent messages of a client, client is disconnected when it's exceeded
+# default parser uses orjson when it's installed, see README for how it differs from `pumpduler.parsers:JSON`
+MESSAGE_PARSER_CLASS: str = "pumpduler.parsers:ORJSON"     # parser class, must have `encode` and `decode` methods, `encode` must support dataclasses, `decode` receives bytes
 
 TIMEZONE = timezone.utc     # timezone to use
 
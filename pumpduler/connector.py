@@ -1,7 +1,6 @@
 import typing
 import socket
 import datetime
-import io
 from .message import PumpdulerMessage
 from .config import MESSAGE_PARSER_CLASS, READ_SIZE
 from .constants import Actions
@@ -30,9 +29,14 @@ class PumpdulerConnector:
             read_size (int, optional): read size from the socket, defaults to `pumpduler.config.READ_SIZE`
         """
         self._socket: socket.socket = None
+        self._timeout: typing.Optional[float] = None    # current timeout of the socket
         self._address: typing.Tuple[str, int] = socket_filepath or (host, port)
         self._read_size: int = read_size or READ_SIZE
-        self._buffer_io: io.BytesIO = io.BytesIO()
+        self._buffer: bytearray = bytearray()   # received data, processed messages are removed from it
+        self._search_from: int = 0  # data before this index has no end char
+        # buffer the socket receives into, reused for every read
+        self._read_buffer: bytearray = bytearray(self._read_size)
+        self._read_view: memoryview = memoryview(self._read_buffer)
         PumpdulerMessage.setup(parser_class or MESSAGE_PARSER_CLASS)
 
     def ping(self):
@@ -94,8 +98,9 @@ class PumpdulerConnector:
     def _get_response_from_sock(self, timeout: typing.Optional[int] = None):
         """
         Reads the data from socket and uses timeout if provided, this
-        will add the data to the buffer object and stops when the character
-        for the ending of the message is received.
+        will add the data to the buffer and stops when the character
+        for the ending of the message is received, nothing is read if the
+        buffer already has a complete message.
 
         Args:
             timeout (int, optional): timeout to set to the socket, defaults to `None`
@@ -105,24 +110,24 @@ class PumpdulerConnector:
                 if connection is disconnected.
 
         Returns:
-            (bool) has received data
+            (int) index of the end char of the first message in the buffer
         """
-        self._setup()
-        self._socket.settimeout(timeout)
-        current_point = self._buffer_io.tell()
-        self._buffer_io.seek(0, io.SEEK_END)
-        while True:
+        # a message may already be in the buffer from the previous read
+        index = self._buffer.find(PumpdulerMessage.MESSAGE_END_SIGN, self._search_from)
+        if index >= 0:
+            return index
+        self._setup(timeout=timeout)
+        while index < 0:
             try:
-                chunk = self._socket.recv(self._read_size)
+                size = self._socket.recv_into(self._read_buffer)
             except ConnectionError:
                 raise PumpdulerDisconnectError("Connection is closed!")
-            else:
-                self._buffer_io.write(chunk)
-                if PumpdulerMessage.MESSAGE_END_SIGN in chunk:
-                    return True
-            finally:
-                self._buffer_io.seek(current_point)
-                self._socket.settimeout(None)
+            if size == 0:
+                raise PumpdulerDisconnectError("Connection is closed!")
+            self._search_from = len(self._buffer)
+            self._buffer += self._read_view[:size]
+            index = self._buffer.find(PumpdulerMessage.MESSAGE_END_SIGN, self._search_from)
+        return index
 
     def get_message(self, timeout: typing.Optional[int] = None):
         """
@@ -138,10 +143,10 @@ class PumpdulerConnector:
         Returns:
             (dict|None) message from the server or can be `None`.
         """
-        has_response = self._get_response_from_sock(timeout=timeout)
-        if has_response is not True:
-            return
-        data = self._buffer_io.readline()
+        index = self._get_response_from_sock(timeout=timeout)
+        data = bytes(self._buffer[:index])
+        del self._buffer[:index + len(PumpdulerMessage.MESSAGE_END_SIGN)]
+        self._search_from = 0
         return PumpdulerMessage.load(data)
 
     def listen(self, timeout: typing.Optional[int] = None):
@@ -217,12 +222,17 @@ class PumpdulerConnector:
             "exec_timestamp": exec_timestamp,
             "data": data
         }
+        self._setup()
         message = PumpdulerMessage.dump(send_data)
         self._socket.sendall(message)
 
-    def _setup(self):
+    def _setup(self, timeout: typing.Optional[float] = None):
         """
-        Setup the socket object, connects and set
+        Setup the socket object, connects and set the timeout, timeout
+        is only changed on the socket if it's different from the current.
+
+        Args:
+            timeout (float, optional): timeout to set to the socket, defaults to `None`
         """
         if self._socket is None:
             if isinstance(self._address, str) is True:
@@ -230,7 +240,10 @@ class PumpdulerConnector:
             else:
                 self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._socket.connect(self._address)
-        self._socket.settimeout(None)
+            self._timeout = None    # new socket is blocking
+        if timeout != self._timeout:
+            self._socket.settimeout(timeout)
+            self._timeout = timeout
 
     def _shutdown(self):
         """
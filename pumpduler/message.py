@@ -9,10 +9,17 @@ class PumpdulerMessage:
     This class provides methods to dump and load the object in a
     specific format, this will also import the parser class using
     the string in config, uses `config.MESSAGE_PARSER_CLASS`
+
+    `setup` must be called once before dumping or loading, server and
+    connector call it when they're created.
     """
     MESSAGE_END_SIGN = b"\n"
     IMPORT_LOCK = threading.Lock()
     parser = None
+    # `encode` and `decode` functions of the parser, kept to call them directly
+    encode: typing.Callable[[typing.Any], bytes] = None
+    decode: typing.Callable[[bytes], typing.Any] = None
+    parser_appends_end_sign = False     # parser's encoded data already ends with `MESSAGE_END_SIGN`
 
     @staticmethod
     def setup(parser_path: typing.Optional[str] = None):
@@ -32,18 +39,21 @@ class PumpdulerMessage:
                 module_name, class_name = parser_path.split(":")
                 module = importlib.import_module(module_name)
                 PumpdulerMessage.parser = getattr(module, class_name)
+                PumpdulerMessage.encode = PumpdulerMessage.parser.encode
+                PumpdulerMessage.decode = PumpdulerMessage.parser.decode
+                PumpdulerMessage.parser_appends_end_sign = getattr(
+                    PumpdulerMessage.parser, "APPENDS_END_SIGN", False
+                ) is True
 
     @staticmethod
     def dump(data: typing.Any):
-        PumpdulerMessage.setup()
-        message = PumpdulerMessage.parser.encode(data)
-        if isinstance(message, bytes) is True:
+        message = PumpdulerMessage.encode(data)
+        if isinstance(message, bytes):
+            if PumpdulerMessage.parser_appends_end_sign:
+                return message
             return message + PumpdulerMessage.MESSAGE_END_SIGN
         raise ValueError(f"{config.MESSAGE_PARSER_CLASS} must return bytes.")
 
     @staticmethod
     def load(data: typing.Union[str, bytes]):
-        PumpdulerMessage.setup()
-        if isinstance(data, bytes) is True:
-            data = data.decode("utf-8")
-        return PumpdulerMessage.parser.decode(data)
+        return PumpdulerMessage.decode(data)
@@ -1,14 +1,47 @@
 import json
 import typing
+import dataclasses
+
+try:
+    import orjson
+except ImportError:     # orjson is optional, `ORJSON` falls back to `JSON` without it
+    orjson = None
+
+
+def _json_default(obj: typing.Any) -> typing.Any:
+    # dataclasses (time events) are serialized with their fields, without
+    # copying the field values like `dataclasses.asdict` does.
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class JSON:
     @staticmethod
     def encode(data: typing.Any) -> bytes:
-        return json.dumps(data).encode("utf-8")
+        return json.dumps(data, default=_json_default).encode("utf-8")
 
     @staticmethod
     def decode(data: typing.Union[str, bytes]) -> typing.Any:
-        if isinstance(data, bytes):
-            data = data.decode("utf-8")
+        # `json.loads` takes the bytes as they're, no need to decode them first
         return json.loads(data)
+
+
+if orjson is not None:
+    class ORJSON:
+        # encoded data already ends with the message end sign, older orjson versions
+        # can't append it so `PumpdulerMessage.dump` appends it for them.
+        APPENDS_END_SIGN = hasattr(orjson, "OPT_APPEND_NEWLINE")
+        # non-str dict keys are converted to str like `json` does
+        _ENCODE_OPTION = getattr(orjson, "OPT_APPEND_NEWLINE", 0) | getattr(orjson, "OPT_NON_STR_KEYS", 0)
+
+        @staticmethod
+        def encode(data: typing.Any) -> bytes:
+            # orjson serializes dataclasses natively
+            return orjson.dumps(data, option=ORJSON._ENCODE_OPTION)
+
+        @staticmethod
+        def decode(data: typing.Union[str, bytes]) -> typing.Any:
+            return orjson.loads(data)
+else:
+    ORJSON = JSON
@@ -1,8 +1,8 @@
 import sys
 import socket
-import threading
 from .import config
 from .client_manager import ClientManager
+from .message import PumpdulerMessage
 from .functions import get_datetime
 from .logger import logger
 
@@ -14,19 +14,11 @@ class Server(object):
     client manager object.
     """
     def __init__(self) -> None:
+        PumpdulerMessage.setup()    # importing the parser once, before any message
         self._sock: socket.socket = None    # nothing for now
         self._client_manager: ClientManager = ClientManager(server=self)    # a client manager
-        self._accept_connections_event = threading.Event()  # an event for stop/start accepting connections
         self._init_time = get_datetime().timestamp()    # timestamp of start
 
-    @property
-    def accept_connections_event(self) -> threading.Event:
-        """
-        Returns:
-            (threading.Event) Event for stopping/starting accepting connections.
-        """
-        return self._accept_connections_event
-
     @property
     def init_time(self) -> float:
         """
@@ -38,21 +30,19 @@ class Server(object):
     def _start_listen(self):
         """
         Start listening to the current socket object,
-        this method will accept the connection and passed it
-        to the client manager and the client manager will take
+        the socket is passed to the client manager and the
+        client manager will accept the connections and take
         care of process.
 
-        This relies on an event `_accept_connections_event` to
-        start/stop accepting incoming requests.
+        Client manager also stops/starts accepting incoming
+        requests depending on the number of the clients.
         """
         logger.debug("starting to listen")
-        self.sock.listen(0)
+        # connections are accepted from the event loop of the client manager
+        self.sock.setblocking(False)
+        self.sock.listen(socket.SOMAXCONN)
         logger.info("waiting for clients to connect...")
-        while True:
-            self._accept_connections_event.wait()
-            client_sock, addr = self.sock.accept()
-            logger.info(f"Client connected: {client_sock} || {addr}")
-            self._client_manager.add_client(client_sock)
+        self._client_manager.run(self.sock)
 
     def _create(self):
         """
@@ -66,6 +56,8 @@ class Server(object):
         # address to the variable.
         if config.HOST and config.PORT:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # restarting server can bind again while old connections are in TIME_WAIT
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             bind_address = (config.HOST, config.PORT)
         elif config.UNIX_SOCKET_PATH is not None:
             self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -74,14 +66,13 @@ class Server(object):
             logger.error("Server socket type and/or binding is not defined!")
             sys.exit(1)
 
-        logger.info(f"binding server to {bind_address}")
+        logger.info("binding server to %s", bind_address)
         try:
             self.sock.bind(bind_address)
         except OSError as e:
-            logger.error(f"Failed to bind socket on: {bind_address}")
-            logger.debug(f"Error occurred during binding: {bind_address}: {e}")
+            logger.error("Failed to bind socket on: %s", bind_address)
+            logger.debug("Error occurred during binding: %s: %s", bind_address, e)
             sys.exit(1)
-        self.accept_connections_event.set()
 
     def start(self):
         """
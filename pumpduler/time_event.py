@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TimeEvent:
     """
-    Contains details about the event that will be executed.
+    Contains details about the event that will be executed, the
+    fields are sent as they're to the subscribers of the channel.
     """
     id: str     # id of the time event
-    channel: str      # channel name to publish in
+    channel_name: str      # channel name to publish in
+    timestamp: float    # timestamp at the time of added
     exec_timestamp: float   # execution time stamp
     data: str   # data to be sent
-    timestamp: float    # timestamp at the time of added
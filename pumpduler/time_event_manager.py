@@ -1,10 +1,12 @@
 import typing
-import threading
+import math
+import time
+import heapq
+import itertools
 import uuid
 from .constants import SeverToClientMessageTypes
 from .time_event import TimeEvent
-from .functions import get_datetime
-from .time_event_executor import TimeEventExecutor, TimeEventExecutorArgs
+from .message import PumpdulerMessage
 from .logger import logger
 
 if typing.TYPE_CHECKING:
@@ -15,12 +17,25 @@ class TimeEventManager(object):
     """
     Manages the time events, this decides what time event should be
     executed first and has methods to add events.
+
+    Time events are executed by the event loop of the client manager,
+    the loop waits until the top time event is due and calls
+    `broadcast_due_events`, so the time events are only accessed from
+    that single thread and do not need any lock.
     """
+    # maximum seconds the event loop waits for the top time event, selectors reject
+    # too large timeouts and the loop re-checks the top time event on every iteration.
+    MAX_TIMEOUT: float = 3600.0
+
     def __init__(self, client_manager: 'ClientManager') -> None:
-        self._time_events: typing.List[TimeEvent] = []   # time event objects
-        self._lock: threading.Lock = threading.Lock()   # lock for the time events
-        self._executor_lock: threading.Lock = threading.Lock()  # lock to manage the executor
-        self._executor: TimeEventExecutor = None    # current executor, this executor holds a time event to execute it.
+        # heap of the time events as (monotonic execution time, order of adding, time event),
+        # monotonic time keeps the waits safe from wall clock changes and
+        # order keeps the events of the same time in the order they're added.
+        self._time_events: typing.List[typing.Tuple[float, int, TimeEvent]] = []
+        self._order: typing.Iterator[int] = itertools.count()
+        # order of adding is also used as the id of the time event, prefix keeps
+        # the ids unique across the restarts of the server.
+        self._id_prefix: str = uuid.uuid4().hex[:8]
         self._client_manager: 'ClientManager' = client_manager  # ref to client manager
 
     def time_events_count(self) -> int:
@@ -30,122 +45,103 @@ class TimeEventManager(object):
         """
         return len(self)
 
-    def _update_executor(self):
+    def get_timeout(self) -> typing.Optional[float]:
         """
-        Updates the executor and sets the time event to be executed to
-        the executor and starts it.
-
-        This will skip the last executor when the new time event execution
-        time is less than the current one, this will compare the id of the
-        time event objects from the list of all time events and from the
-        time event executor, if they're different then the current executor
-        will skip the execution and new executor will be created to execute
-        the time event.
+        Returns:
+            (float, optional) seconds until the top time event is due, at most `MAX_TIMEOUT`, `None` when there's no time event.
         """
-        logger.debug("Updating time event executor")
-        with self._executor_lock:
-            # get the current event
-            current_time_event = self.get_event()
-            # check if there's executor already or not
-            if self._executor is not None:
-                if current_time_event is not None:  # if has the time event
-                    # compare the ids to check time events are same or not
-                    if self._executor.time_event_id == current_time_event.id:
-                        logger.debug("Executor is not updated as its the same as was before!")
-                        return  # no need to update the executor if the ids are same.
-                logger.debug(f"Skipping the current executor with id:{self._executor.time_event_id}")
-                self._executor.skip()   # tell the executor to skip the job as new time event is arrived.
-
-            if current_time_event is not None:
-                logger.debug(f"Adding time event [id:{current_time_event.id}] to the executor")
-                args = TimeEventExecutorArgs(
-                    time_event=current_time_event,
-                    broadcast_func=self._broadcast
-                )
-                self._executor = TimeEventExecutor(args=args)
-                self._executor.start()  # starting new time event executor
-                logger.debug(f"New executor started for the id:{current_time_event.id}")
+        if len(self._time_events) > 0:
+            return min(max(self._time_events[0][0] - time.monotonic(), 0), self.MAX_TIMEOUT)
+        return None
 
     def add_event(self, channel: str, data: typing.Any, exec_dt: float):
         """
-        Add an event to the list of the time events, this also adjust the
-        executor to execute the time event.
+        Add an event to the heap of the time events, event loop of the
+        client manager re-checks the top time event after handling the
+        clients, so no wake up is needed.
 
         Args:
             channel (str): name of then channel
             data (Any): data that can be parsed and encoded by parser
             exec_dt (float): execution timestamp
 
+        Raises:
+            ValueError:
+                if the execution timestamp is not a finite number.
+
         Returns:
             (None)
         """
         logger.info("Event received to be added!")
-        with self._lock:
-            time_event = TimeEvent(
-                id=uuid.uuid4().hex,
-                channel=channel,
-                exec_timestamp=exec_dt,
-                data=data,
-                timestamp=get_datetime().timestamp()
-            )
-            self._time_events.append(time_event)
-            logger.debug(f"Event:{time_event.id} is added to the time events")
-            # sort the time events using execution timestamp
-            self._time_events.sort(key=lambda event: event.exec_timestamp)
-            self._update_executor()  # update the executor
+        if isinstance(exec_dt, bool) or not isinstance(exec_dt, (int, float)) or not math.isfinite(exec_dt):
+            raise ValueError(f"Invalid execution timestamp: {exec_dt!r}")
+        timestamp = time.time()
+        order = next(self._order)
+        time_event = TimeEvent(
+            id=f"{self._id_prefix}-{order}",
+            channel_name=channel,
+            timestamp=timestamp,
+            exec_timestamp=exec_dt,
+            data=data
+        )
+        exec_monotonic = time.monotonic() + (exec_dt - timestamp)
+        heapq.heappush(self._time_events, (exec_monotonic, order, time_event))
+        logger.debug("Event:%s is added to the time events", time_event.id)
 
     def get_event(self):
         """
         Returns:
-            (pumpduler.time_event.TimeEvent) the top event, the event at 0th index.
+            (pumpduler.time_event.TimeEvent) the top event, the event with the lowest execution timestamp.
         """
         if len(self._time_events) > 0:
-            return self._time_events[0]
+            return self._time_events[0][2]
 
-    def _broadcast(self, time_event: TimeEvent):
+    def broadcast_due_events(self):
         """
-        Send the message to the channel, uses client manager method to send
-        it to the channel, this will also check for the time event id to
-        ensure this should be executed or not.
-
-        This broadcast will only happen if the time event is at the 0th index
-        of the time events list.
+        Send the messages of all the time events that are due by now to their
+        channels, uses client manager method to send them to the channels.
 
-        Removes the time event and updates the executor for new time event,
-        if any exception occurred while sending the time event then the time
-        event won't be removed from the list.
+        Removes the sent time events, if any exception occurred while sending
+        a time event then that time event is removed and the ones after it are
+        left for the next iteration of the event loop.
 
-        Args:
-            time_event (pumpduler.time_event.TimeEvent): time event object
+        Messages are only queued to the clients, the event loop sends them.
 
         Returns:
             (None)
         """
+        time_events = self._time_events
+        due_monotonic = time.monotonic()
+        if len(time_events) == 0 or time_events[0][0] > due_monotonic:
+            return
         logger.info("[:TimeEventManager] broadcasting a message!")
-        logger.debug(f"[:TimeEventManager] broadcasting a message with id: {time_event.id}")
-        with self._lock:
-            stored_first_event = self.get_event()
-            if stored_first_event is not None:
-                if stored_first_event.id == time_event.id:
-                    try:
-                        message_data = {
-                            "id": time_event.id,
-                            "channel_name": time_event.channel,
-                            "timestamp": time_event.timestamp,
-                            "exec_timestamp": time_event.exec_timestamp,
-                            "data": time_event.data
-                        }
-                        self._client_manager.channel_manager.broadcast_message(
-                            channel_names=[time_event.channel],
-                            message_type=SeverToClientMessageTypes.TIME_EVENT,
-                            message_data=message_data
-                        )
-                    except Exception as e:
-                        logger.error(f"Exception in TimeEventManager._broadcast: {e}")
-                    else:
-                        removed_time_event = self._time_events.pop(0)
-                        logger.debug(f"Time event removed at index [0]:[id:{removed_time_event.id}]")
-                        self._update_executor()
+        # binding the lookups once, they're used for every due time event
+        channel_manager = self._client_manager.channel_manager
+        broadcast_raw = channel_manager.broadcast_raw
+        dump = PumpdulerMessage.dump
+        heappop = heapq.heappop
+        try:
+            while len(time_events) > 0 and time_events[0][0] <= due_monotonic:
+                current_time_event = time_events[0][2]
+                logger.debug("[:TimeEventManager] broadcasting a message with id: %s", current_time_event.id)
+                # time event is not dumped when nobody is subscribed to its channel
+                if current_time_event.channel_name in channel_manager:
+                    # time event is dumped as it is, the parser serializes the dataclass
+                    payload = dump({
+                        "type": SeverToClientMessageTypes.TIME_EVENT,
+                        "data": current_time_event
+                    })
+                    broadcast_raw(
+                        channel_names=(current_time_event.channel_name,),
+                        payload=payload
+                    )
+                removed_time_event = heappop(time_events)[2]
+                logger.debug("Time event removed from the top:[id:%s]", removed_time_event.id)
+        except Exception as e:
+            logger.error("Exception in TimeEventManager.broadcast_due_events: %s", e)
+            # drop the failing time event, otherwise the event loop would retry it forever
+            removed_time_event = heappop(time_events)[2]
+            logger.debug("Time event removed from the top:[id:%s]", removed_time_event.id)
 
     def __len__(self):
         return len(self._time_events)
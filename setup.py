@@ -12,6 +12,9 @@ setup(
     description=DESCRIPTION,
     long_description=LONG_DESCRIPTION,
     install_requires=[],
+    extras_require={
+        "orjson": ["orjson>=3.5"],
+    },
     python_requires=">3.10.11",
     license="MIT",
     url="https://github.com/hakiKhuva/pumpduler",